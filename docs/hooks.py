@@ -5,10 +5,17 @@ import os
 from dataclasses import dataclass
 from typing import Dict, List
 
+import numpy as np
 from mkdocs.config.defaults import MkDocsConfig
 from mkdocs.structure.nav import Page
 
 
+try:
+    import orjson
+except ImportError:  # Optional dependency, fallback to `json`
+    orjson = None
+
+
 @dataclass
 class DynamicEntry:
     """Represents a dynamic entry for a data table : the data will be pulled
@@ -34,125 +41,109 @@ def on_page_markdown(markdown: str, page: Page, config: MkDocsConfig, **kwargs)
     Returns:
         str: The updated markdown content.
     """
-    if "leaderboards" in page.file.src_uri:
-        lines = markdown.split("\n")
-        entries = []
-        for line in lines:
-            if line.startswith(">>>"):
-                # This is a line with a path to a result file
-                # -> parse it and extract the results
-                name, result_file_path, *args = line[3:].split("|")
-
+    # Each leaderboard implements its own render logic
+    renderer = RENDERERS.get(os.path.basename(page.file.src_uri)) if "leaderboards" in page.file.src_uri else None
+    if renderer is None:
+        return markdown
+
+    lines = markdown.split("\n")
+    entries = []
+    for line in lines:
+        if line.startswith(">>>"):
+            # This is a line with a path to a result file
+            # -> parse it and extract the results
+            name, result_file_path, *args = line[3:].split("|")
+
+            if orjson is not None:
+                with open(os.path.join(config.docs_dir, result_file_path), "rb") as f:
+                    res = orjson.loads(f.read())
+            else:
                 with open(os.path.join(config.docs_dir, result_file_path), "r") as f:
                     res = json.load(f)
 
-                entries.append(DynamicEntry(name, res, args))
+            entries.append(DynamicEntry(name, res, args))
 
-        # Each leaderboard implements its own render logic
-        rendered_entries = [None for _ in entries]
-        if page.file.src_uri.endswith("main.md"):
-            rendered_entries = render_main(entries)
-        elif page.file.src_uri.endswith("compare.md"):
-            rendered_entries = render_compare(entries)
+    rendered_entries = renderer(entries)
 
-        # Replace the lines accordingly
-        for i, line in enumerate(lines):
-            if line.startswith(">>>"):
-                lines[i] = rendered_entries.pop(0)
+    # Replace the lines accordingly
+    rendered_entries = iter(rendered_entries)
+    for i, line in enumerate(lines):
+        if line.startswith(">>>"):
+            lines[i] = next(rendered_entries)
 
-        return "\n".join(lines)
+    return "\n".join(lines)
 
 
 def render_main(entries: List[DynamicEntry]) -> List[str]:
     """Code for rendering the leaderboard : `leaderboards/main.md`."""
-    # Extract the scores we are going to use
-    for e in entries:
-        e.score = e.results["overall_score"]
-        e.nwp = e.results["next_word_prediction"]["score"]["top3_accuracy"]
-        e.acp = e.results["auto_completion"]["score"]["top3_accuracy"]
-        e.acr = e.results["auto_correction"]["score"]["fscore"]
-
-    # Sort entries according to the overall score
-    entries.sort(reverse=True, key=lambda e: e.score)
+    # Extract the scores we are going to use (one row per entry, one column per
+    # score)
+    scores = np.array(
+        [
+            (
+                e.results["overall_score"],
+                e.results["auto_correction"]["score"]["fscore"],
+                e.results["auto_completion"]["score"]["top3_accuracy"],
+                e.results["next_word_prediction"]["score"]["top3_accuracy"],
+            )
+            for e in entries
+        ]
+    )
 
     # Find the best scores to highlight for each column
-    best_score = max(e.score for e in entries)
-    best_nwp = max(e.nwp for e in entries)
-    best_acp = max(e.acp for e in entries)
-    best_acr = max(e.acr for e in entries)
+    is_best = scores == scores.max(axis=0)
 
-    # Render the entries
+    # Render the entries, sorted according to the overall score
     rendered_entries = []
-    for e in entries:
-        score = f"{round(e.score, 2):g}"
-        nwp = f"{round(e.nwp, 2):g}"
-        acp = f"{round(e.acp, 2):g}"
-        acr = f"{round(e.acr, 2):g}"
+    for i in np.argsort(-scores[:, 0], kind="stable"):
+        cells = [f"{round(x, 2):g}" for x in scores[i].tolist()]
 
         # Highlight the best scores
-        if e.score == best_score:
-            score = f"**{score}**"
-        if e.nwp == best_nwp:
-            nwp = f"**{nwp}**"
-        if e.acp == best_acp:
-            acp = f"**{acp}**"
-        if e.acr == best_acr:
-            acr = f"**{acr}**"
+        cells = [f"**{c}**" if b else c for c, b in zip(cells, is_best[i])]
 
         # Render
-        rendered_entries.append(f"| {e.name} | {score} | {acr} | {acp} | {nwp} |")
+        rendered_entries.append(f"| {' | '.join([entries[i].name, *cells])} |")
 
     return rendered_entries
 
 
 def render_compare(entries: List[DynamicEntry]) -> List[str]:
     """Code for rendering the leaderboard : `leaderboards/compare.md`."""
-    # Extract the scores we are going to use
-    for e in entries:
-        e.score = e.results["overall_score"]
-        e.nwp = e.results["next_word_prediction"]["score"]["top3_accuracy"]
-        e.acp = e.results["auto_completion"]["score"]["top3_accuracy"]
-        e.acr_detection = e.results["auto_correction"]["score"]["recall"]
-        e.acr_relevance = e.results["auto_correction"]["score"]["precision"]
-
-    # Sort entries according to the overall score
-    entries.sort(reverse=True, key=lambda e: e.score)
+    # Extract the scores we are going to use (one row per entry, one column per
+    # score)
+    scores = np.array(
+        [
+            (
+                e.results["overall_score"],
+                e.results["auto_correction"]["score"]["recall"],
+                e.results["auto_correction"]["score"]["precision"],
+                e.results["auto_completion"]["score"]["top3_accuracy"],
+                e.results["next_word_prediction"]["score"]["top3_accuracy"],
+            )
+            for e in entries
+        ]
+    )
 
     # Find the best scores to highlight for each column
-    best_score = max(e.score for e in entries)
-    best_nwp = max(e.nwp for e in entries)
-    best_acp = max(e.acp for e in entries)
-    best_acr_detection = max(e.acr_detection for e in entries)
-    best_acr_relevance = max(e.acr_relevance for e in entries)
+    is_best = scores == scores.max(axis=0)
 
-    # Render the entries
+    # Render the entries, sorted according to the overall score
     rendered_entries = []
-    for e in entries:
-        score = f"{round(e.score * 1000)}"
-        nwp = f"{round(e.nwp * 100)}%"
-        acp = f"{round(e.acp * 100)}%"
-        acr_detection = f"{round(e.acr_detection * 100)}%"
-        acr_relevance = f"{round(e.acr_relevance * 100)}%"
+    for i in np.argsort(-scores[:, 0], kind="stable"):
+        score, *percentages = scores[i].tolist()
+        cells = [f"{round(score * 1000)}"] + [f"{round(x * 100)}%" for x in percentages]
 
         # Highlight the best scores
-        if e.score == best_score:
-            score = f"**{score}**"
-        if e.nwp == best_nwp:
-            nwp = f"**{nwp}**"
-        if e.acp == best_acp:
-            acp = f"**{acp}**"
-        if e.acr_detection == best_acr_detection:
-            acr_detection = f"**{acr_detection}**"
-        if e.acr_relevance == best_acr_relevance:
-            acr_relevance = f"**{acr_relevance}**"
+        cells = [f"**{c}**" if b else c for c, b in zip(cells, is_best[i])]
 
         # Render
-        additional_fields = " | ".join(e.additional_fields)
-        if additional_fields != "":
-            rendered_entries.append(
-                f"| {e.name} | {score} | {acr_detection} | {acr_relevance} | {acp} | {nwp} | {additional_fields} |"
-            )
-        else:
-            rendered_entries.append(f"| {e.name} | {score} | {acr_detection} | {acr_relevance} | {acp} | {nwp} |")
+        rendered_entries.append(f"| {' | '.join([entries[i].name, *cells, *entries[i].additional_fields])} |")
 
     return rendered_entries
+
+
+# Render function to use for each leaderboard page
+RENDERERS = {
+    "main.md": render_main,
+    "compare.md": render_compare,
+}
@@ -0,0 +1,63 @@
+"""Module containing the compiled kernels used in the hot paths of the noise
+model.
+
+These kernels are compiled with Numba, which is an optional dependency
+(`pip install kebbie[speedups]`). If Numba is not installed, `NUMBA_AVAILABLE`
+is set to `False` and callers should use their pure-python implementation
+instead.
+"""
+
+import math
+
+import numpy as np
+
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback decorator used when Numba is not installed : the function
+        is left untouched.
+        """
+
+        def decorator(fn):
+            return fn
+
+        return decorator
+
+
+@njit(cache=True)
+def find_key(x: float, y: float, bounds: np.ndarray, centers: np.ndarray) -> int:
+    """Find the key associated with the given position, in a single pass over
+    the keys of a keyboard layer.
+
+    The first key containing the position is returned. If no key contains the
+    position (the position is out of bound), the closest key is returned.
+
+    Args:
+        x (float): Position on the x-axis.
+        y (float): Position on the y-axis.
+        bounds (np.ndarray): Bounding boxes of the keys, as an array of shape
+            `(N, 4)`, where each row is `(left, top, right, bottom)`.
+        centers (np.ndarray): Center positions of the keys, as an array of
+            shape `(N, 2)`.
+
+    Returns:
+        Index of the key.
+    """
+    closest_idx = 0
+    closest_dist = math.inf
+    for i in range(bounds.shape[0]):
+        if bounds[i, 0] <= x <= bounds[i, 2] and bounds[i, 1] <= y <= bounds[i, 3]:
+            return i
+
+        d = (centers[i, 0] - x) ** 2 + (centers[i, 1] - y) ** 2
+        if d < closest_dist:
+            closest_idx = i
+            closest_dist = d
+
+    return closest_idx
@@ -14,8 +14,15 @@ class Corrector:
 
     By default, the implementation for these methods is dummy : just return an
     empty list of candidates.
+
+    Set `rss_memory` to `True` to measure the memory usage of the profiled
+    methods as the peak growth of the resident memory, instead of tracing
+    allocations with `tracemalloc` (cheaper, but usually 0 after a warm-up,
+    see `profile_fn`).
     """
 
+    rss_memory: bool = False
+
     def auto_correct(
         self,
         context: str,
@@ -112,7 +119,7 @@ class Corrector:
             Memory consumption in bytes.
             Runtime in nano seconds.
         """
-        return profile_fn(self.auto_correct, *args, **kwargs)
+        return profile_fn(self.auto_correct, *args, rss_memory=self.rss_memory, **kwargs)
 
     def profiled_auto_complete(self, *args, **kwargs) -> Tuple[List[str], int, int]:
         """Profiled (memory & runtime) version of `auto_complete` method.
@@ -125,7 +132,7 @@ class Corrector:
             Memory consumption in bytes.
             Runtime in nano seconds.
         """
-        return profile_fn(self.auto_complete, *args, **kwargs)
+        return profile_fn(self.auto_complete, *args, rss_memory=self.rss_memory, **kwargs)
 
     def profiled_resolve_swipe(self, *args, **kwargs) -> Tuple[List[str], int, int]:
         """Profiled (memory & runtime) version of `resolve_swipe` method.
@@ -138,7 +145,7 @@ class Corrector:
             Memory consumption in bytes.
             Runtime in nano seconds.
         """
-        return profile_fn(self.resolve_swipe, *args, **kwargs)
+        return profile_fn(self.resolve_swipe, *args, rss_memory=self.rss_memory, **kwargs)
 
     def profiled_predict_next_word(self, *args, **kwargs) -> Tuple[List[str], int, int]:
         """Profiled (memory & runtime) version of `predict_next_word` method.
@@ -151,7 +158,7 @@ class Corrector:
             Memory consumption in bytes.
             Runtime in nano seconds.
         """
-        return profile_fn(self.predict_next_word, *args, **kwargs)
+        return profile_fn(self.predict_next_word, *args, rss_memory=self.rss_memory, **kwargs)
 
 
 class EmulatorCorrector(Corrector):
@@ -66,6 +66,9 @@ IOS_TYPING_FIELD_ID = "messageBodyField"
 IOS_START_CHAT_CLASS_NAME = "XCUIElementTypeCell"
 TESSERACT_CONFIG = "-c tessedit_char_blacklist=0123456789”:!@·$%&/()=.¿?"
 PREDICTION_DELAY = 0.4
+ANDROID_DEVICE_RE = re.compile(rb"^(\S+)\tdevice\s*$", re.MULTILINE)
+IOS_RUNTIME_RE = re.compile(rb"^-- iOS (.+) --$((?:\n[ \t].*)*)", re.MULTILINE)
+IOS_BOOTED_DEVICE_RE = re.compile(rb"^[ \t]+([^\t\n]+)[ \t]+\([A-Z0-9\-]+\)[ \t]+\(Booted\)", re.MULTILINE)
 CONTENT_TO_IGNORE = [
     "Sticker",
     "GIF",
@@ -404,13 +407,24 @@ class Emulator:
         """Static method that uses the `adb devices` command to retrieve the
         list of devices running.
 
+        Only the devices that are ready (in the `device` state) are returned.
+
         Returns:
             List of detected device UDID.
         """
         result = subprocess.run(["adb", "devices"], stdout=subprocess.PIPE)
-        devices = result.stdout.decode().split("\n")
-        devices = [d.split()[0] for d in devices if not (d.startswith("List of devices attached") or len(d) == 0)]
-        return devices
+        return Emulator._parse_android_devices(result.stdout)
+
+    def _parse_android_devices(output: bytes) -> List[str]:
+        """Static method that parses the output of the `adb devices` command.
+
+        Args:
+            output (bytes): Raw output of the `adb devices` command.
+
+        Returns:
+            List of detected device UDID.
+        """
+        return [udid.decode() for udid in ANDROID_DEVICE_RE.findall(output)]
 
     def select_keyboard(self, keyboard):
         """Searches the IME of the desired keyboard and selects it, only for Android.
@@ -446,27 +460,26 @@ class Emulator:
         Returns:
             List of booted device platform and device name.
         """
-        devices = []
-
         result = subprocess.run(["xcrun", "simctl", "list", "devices"], stdout=subprocess.PIPE)
-        out = result.stdout.decode().split("\n")
+        return Emulator._parse_ios_devices(result.stdout)
 
-        curr_platform = ""
-        for line in out:
-            if line.startswith("== ") and line.endswith(" =="):
-                continue
-            elif line.startswith("-- ") and line.endswith(" --"):
-                curr_platform = line[3:-3]
-            else:
-                m = re.match(r"\s+([^\t]+)\s+\([A-Z0-9\-]+\)\s+\((Booted|Shutdown)\)", line)
-                if m:
-                    device_name = m.group(1)
-                    status = m.group(2)
+    def _parse_ios_devices(output: bytes) -> List[Tuple[str, str]]:
+        """Static method that parses the output of the `xcrun simctl list
+        devices` command.
 
-                    if status == "Booted" and curr_platform.startswith("iOS "):
-                        devices.append((curr_platform[4:], device_name))
+        Args:
+            output (bytes): Raw output of the `xcrun simctl list devices`
+                command.
 
-        return devices
+        Returns:
+            List of booted device platform and device name.
+        """
+        # Find each block of iOS devices, and extract the booted devices from it
+        return [
+            (platform.decode(), device_name.decode())
+            for platform, block in IOS_RUNTIME_RE.findall(output)
+            for device_name in IOS_BOOTED_DEVICE_RE.findall(block)
+        ]
 
     def _paste(self, text: str):
         """Paste the given text into the typing field, to quickly simulate
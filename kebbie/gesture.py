@@ -8,8 +8,6 @@ from typing import List, Tuple
 import numpy as np
 from scipy.special import comb
 
-from kebbie.utils import euclidian_dist
-
 
 MAX_RADIUS = 16
 MIN_N_POINTS_PER_DIST = 0.1
@@ -39,10 +37,13 @@ def make_swipe_gesture(control_points: List[Tuple[float, float]]) -> List[Tuple[
     speed = random.uniform(MIN_N_POINTS_PER_DIST, MAX_N_POINTS_PER_DIST)
     acceleration = random.uniform(MIN_ACCELERATION, MAX_ACCELERATION)
 
+    # The distance between 2 consecutive points will dictate the speed and
+    # radius of the curve between them. Compute all these distances at once
+    points = np.asarray(control_points, dtype=np.float64)
+    distances = np.sqrt(((points[1:] - points[:-1]) ** 2).sum(axis=1)).tolist()
+
     # Generate bezier curves between each control points
-    for p1, p2 in zip(control_points[:-1], control_points[1:]):
-        # The distance between the 2 points will dictate the speed and radius
-        d = euclidian_dist(p1, p2)
+    for p1, p2, d in zip(control_points[:-1], control_points[1:], distances):
         radius = min(d, MAX_RADIUS)
         n_points = max(1, int(d * speed))
 
@@ -91,6 +92,9 @@ def bernstein_poly(i: int, n: int, t: float) -> float:
 
     Taken from : https://stackoverflow.com/a/12644499/9494790
 
+    It also works with NumPy arrays (following the broadcasting rules), to
+    compute several values at once.
+
     Args:
         i (int): i
         n (int): n
@@ -120,13 +124,14 @@ def bezier_curve(control_points: List[Tuple[float, float]], linspace: List[float
         Sampled points along the bezier curve.
     """
     n_points = len(control_points)
-    x_points = np.array([p[0] for p in control_points])
-    y_points = np.array([p[1] for p in control_points])
+    points = np.asarray(control_points, dtype=np.float64)
 
-    polynomial_array = np.array([bernstein_poly(i, n_points - 1, linspace) for i in range(0, n_points)])
+    # Compute the polynomials for all control points at once, by broadcasting
+    # the control point indices against the linspace
+    polynomial_array = bernstein_poly(np.arange(n_points)[:, None], n_points - 1, np.asarray(linspace)[None, :])
 
-    x_vals = np.dot(x_points, polynomial_array)
-    y_vals = np.dot(y_points, polynomial_array)
+    x_vals = np.dot(points[:, 0], polynomial_array)
+    y_vals = np.dot(points[:, 1], polynomial_array)
 
     return x_vals, y_vals
 
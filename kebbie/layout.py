@@ -6,9 +6,11 @@ from collections import defaultdict
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import regex as re
 
-from kebbie.utils import euclidian_dist, load_keyboard
+from kebbie._noise_kernels import NUMBA_AVAILABLE, find_key
+from kebbie.utils import euclidian_dists_sq, load_keyboard
 
 
 SPACE = "spacebar"
@@ -66,6 +68,29 @@ class LayoutHelper:
     def __init__(self, lang: str = "en-US", custom_keyboard: Dict = None, ignore_layers_after: Optional[int] = None):
         keyboard = custom_keyboard if custom_keyboard is not None else load_keyboard(lang)
         self.keys_info, self.klayers_info, self.accents = self._extract_infos(keyboard["layout"], ignore_layers_after)
+        self.klayers_centers = {
+            klayer_id: np.array(
+                [
+                    (
+                        k.bounds["left"] + (k.bounds["right"] - k.bounds["left"]) / 2,
+                        k.bounds["top"] + (k.bounds["bottom"] - k.bounds["top"]) / 2,
+                    )
+                    for k in klayer
+                ],
+                dtype=np.float64,
+            )
+            for klayer_id, klayer in self.klayers_info.items()
+        }
+        self.klayers_bounds = {
+            klayer_id: np.array(
+                [(k.bounds["left"], k.bounds["top"], k.bounds["right"], k.bounds["bottom"]) for k in klayer],
+                dtype=np.float64,
+            )
+            for klayer_id, klayer in self.klayers_info.items()
+        }
+        # Same data, but as plain Python lists (faster to iterate without Numba)
+        self.klayers_chars = {klayer_id: [k.char for k in klayer] for klayer_id, klayer in self.klayers_info.items()}
+        self.klayers_bounds_list = {klayer_id: bounds.tolist() for klayer_id, bounds in self.klayers_bounds.items()}
         self.letter_accents = [c for c in self.accents if re.match(r"^[\pL]+$", c)]
         self.spelling_symbols = keyboard["settings"]["allowed_symbols_in_words"]
         self.layout_name = keyboard["keyboard"]["default-layout"]
@@ -232,26 +257,17 @@ class LayoutHelper:
         Returns:
             Character associated to the given position.
         """
-        klayer = self.klayers_info[klayer_id]
-
-        try:
-            # Retrieve the key that contains the sampled position
-            key = next(
-                k
-                for k in klayer
-                if k.bounds["left"] <= pos[0] <= k.bounds["right"] and k.bounds["top"] <= pos[1] <= k.bounds["bottom"]
-            )
-        except StopIteration:
-            # Maybe the sampled position was out of bound -> retrieve the closest key
-            key = min(
-                klayer,
-                key=lambda k: euclidian_dist(
-                    pos,
-                    (
-                        k.bounds["left"] + (k.bounds["right"] - k.bounds["left"]) / 2,
-                        k.bounds["top"] + (k.bounds["bottom"] - k.bounds["top"]) / 2,
-                    ),
-                ),
-            )
+        chars = self.klayers_chars[klayer_id]
+
+        if NUMBA_AVAILABLE:
+            idx = find_key(pos[0], pos[1], self.klayers_bounds[klayer_id], self.klayers_centers[klayer_id])
+            return chars[idx]
+
+        # Retrieve the key that contains the sampled position
+        x, y = pos
+        for i, (left, top, right, bottom) in enumerate(self.klayers_bounds_list[klayer_id]):
+            if left <= x <= right and top <= y <= bottom:
+                return chars[i]
 
-        return key.char
+        # Maybe the sampled position was out of bound -> retrieve the closest key
+        return chars[euclidian_dists_sq(pos, self.klayers_centers[klayer_id]).argmin()]
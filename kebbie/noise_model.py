@@ -3,6 +3,7 @@ typos in a clean text (and later see if the model can properly correct these
 typos).
 """
 
+import functools
 import json
 import os
 import random
@@ -16,11 +17,19 @@ import requests
 
 from kebbie.gesture import make_swipe_gesture
 from kebbie.layout import LayoutHelper
-from kebbie.utils import sample, sample_among, strip_accents
+from kebbie.utils import load_json, sample, strip_accents
 
 
 class Typo(Enum):
-    """Enum listing all possible typos that can be introduced."""
+    """Enum listing all possible typos that can be introduced.
+
+    Typos are used as dictionary keys for each typed character, so members are
+    hashed by identity (members are singletons, and they are compared by
+    identity anyway) instead of the default `Enum.__hash__`, which is
+    implemented in Python.
+    """
+
+    __hash__ = object.__hash__
 
     # Deletions
     DELETE_SPELLING_SYMBOL = "DELETE_SPELLING_SYMBOL"
@@ -71,11 +80,19 @@ DEFAULT_TYPO_PROBS = {
     Typo.COMMON_TYPO: 0.05,
 }
 SPACE = " "
-DELETIONS = [Typo.DELETE_SPELLING_SYMBOL, Typo.DELETE_SPACE, Typo.DELETE_PUNCTUATION, Typo.DELETE_CHAR]
+DELETIONS = (Typo.DELETE_SPELLING_SYMBOL, Typo.DELETE_SPACE, Typo.DELETE_PUNCTUATION, Typo.DELETE_CHAR)
+ADDITIONS = (Typo.ADD_SPELLING_SYMBOL, Typo.ADD_SPACE, Typo.ADD_PUNCTUATION, Typo.ADD_CHAR)
+# Possible (deletion, addition) typos for each type of character
+SPELLING_SYMBOL_TYPOS = (Typo.DELETE_SPELLING_SYMBOL, Typo.ADD_SPELLING_SYMBOL)
+SPACE_TYPOS = (Typo.DELETE_SPACE, Typo.ADD_SPACE)
+PUNCTUATION_TYPOS = (Typo.DELETE_PUNCTUATION, Typo.ADD_PUNCTUATION)
+CHAR_TYPOS = (Typo.DELETE_CHAR, Typo.ADD_CHAR)
 FRONT_DELETION_MULTIPLIER = 0.36  # Reduce probability of a front deletion
 DEFAULT_SIGMA_RATIO = 3  # Equivalent of 99% typing the right letter (1% chance of a typo)
 CACHE_DIR = os.path.expanduser("~/.cache/common_typos/")
 TWEET_TYPO_CORPUS_URL = "https://luululu.com/tweet/typo-corpus-r1.txt"
+# Unicode category `L` (see https://en.wikipedia.org/wiki/Unicode_character_property#General_Category)
+LETTER_RE = re.compile(r"\pL")
 
 
 class NoiseModel:
@@ -136,9 +153,15 @@ class NoiseModel:
         self.lang = lang
         self.x_offset, self.y_offset = x_offset, y_offset
         self.x_ratio, self.y_ratio = x_ratio, y_ratio
-        self.klayout = LayoutHelper(self.lang, custom_keyboard=custom_keyboard, ignore_layers_after=3)
+        self.klayout = (
+            LayoutHelper(self.lang, custom_keyboard=custom_keyboard, ignore_layers_after=3)
+            if custom_keyboard is not None
+            else load_default_layout(self.lang)
+        )
         self.probs = typo_probs if typo_probs is not None else DEFAULT_TYPO_PROBS
         self.common_typos = common_typos if common_typos is not None else self._get_common_typos()
+        self.letter_accents = set(self.klayout.letter_accents)
+        self.char_typos = self._get_char_typos()
 
     def type_till_space(
         self,
@@ -167,22 +190,22 @@ class NoiseModel:
             The list of typos introduced in the string typed.
         """
         all_keystrokes = []
-        all_typed_char = ""
+        all_typed_char = []
         all_typos = []
 
         for i, word in enumerate(words):
             # Some words can't be corrected (numbers, symbols, etc...) -> Don't introduce typos
-            error_free = False if self._is_correctable(word) else True
+            error_free = not self._is_correctable(word)
 
             # Add typos in the word
             noisy_word, typos = self._introduce_typos(word, error_free=error_free)
-            all_typos += typos
+            all_typos.extend(typos)
 
             # Type the word (fuzzy)
             keystrokes, typed_char, typos = self._fuzzy_type(noisy_word, error_free=error_free)
-            all_keystrokes += keystrokes
-            all_typed_char += typed_char
-            all_typos += typos
+            all_keystrokes.extend(keystrokes)
+            all_typed_char.append(typed_char)
+            all_typos.extend(typos)
 
             # Then, we try to type a space (separator between words)
             # TODO : Modify this part for languages without space
@@ -193,11 +216,12 @@ class NoiseModel:
             if not sp_typo_1 and not sp_typo_2:
                 break
             else:
-                all_keystrokes += keystrokes
-                all_typed_char += typed_char
-                all_typos += sp_typo_1 + sp_typo_2
+                all_keystrokes.extend(keystrokes)
+                all_typed_char.append(typed_char)
+                all_typos.extend(sp_typo_1)
+                all_typos.extend(sp_typo_2)
 
-        return all_keystrokes, all_typed_char, i + 1, all_typos
+        return all_keystrokes, "".join(all_typed_char), i + 1, all_typos
 
     def swipe(self, word: str) -> Optional[List[Tuple[float, float]]]:
         """Method for creating an artificial swipe gesture given a word.
@@ -259,73 +283,58 @@ class NoiseModel:
             # lowercasing an uppercase character)
             # Note that if the full word is uppercase, we don't apply lowercase
             # simplification (doesn't feel like a natural typo a user would do)
-            if char in self.klayout.letter_accents and sample(self.probs[Typo.SIMPLIFY_ACCENT]):
+            if char in self.letter_accents and sample(self.probs[Typo.SIMPLIFY_ACCENT]):
                 char = strip_accents(char)
                 typos.append(Typo.SIMPLIFY_ACCENT)
             if char.isupper() and len(word) > 1 and not word.isupper() and sample(self.probs[Typo.SIMPLIFY_CASE]):
                 char = char.lower()
                 typos.append(Typo.SIMPLIFY_CASE)
 
-            # Check if this character exists on our keyboard
-            try:
-                *_, klayer_id = self.klayout.get_key_info(char)
-                char_is_on_kb = True
-                char_is_on_default_kb = klayer_id == 0
-            except KeyError:
-                char_is_on_kb = char_is_on_default_kb = False
-
             # Then, add the possible typo depending on the character type
-            events = []
+            # Characters that are not in `char_typos` (numbers or symbols that
+            # are not on keyboard) can't have typos
+            events = ()
             is_first_char = bool(i == 0)
             is_last_char = bool(i >= (len(word_chars) - 1))
-            if char.isnumeric() or not char_is_on_kb:
-                # Don't introduce typos for numbers or symbols that are not on keyboard
-                pass
-            else:
+            if char in self.char_typos:
+                klayer_id, events = self.char_typos[char]
+
                 if not is_last_char:
                     # Only transpose char if they are on the same keyboard layer
-                    try:
-                        *_, next_char_klayer_id = self.klayout.get_key_info(word[i + 1])
-                    except KeyError:
-                        next_char_klayer_id = None
-
-                    if klayer_id == next_char_klayer_id:
-                        events.append(Typo.TRANSPOSE_CHAR)
-                if char in self.klayout.spelling_symbols:
-                    events.append(Typo.DELETE_SPELLING_SYMBOL)
-                    events.append(Typo.ADD_SPELLING_SYMBOL)
-                elif char.isspace():
-                    events.append(Typo.DELETE_SPACE)
-                    events.append(Typo.ADD_SPACE)
-                elif char in string.punctuation:
-                    events.append(Typo.DELETE_PUNCTUATION)
-                    events.append(Typo.ADD_PUNCTUATION)
-                elif char_is_on_default_kb:
-                    events.append(Typo.DELETE_CHAR)
-                    events.append(Typo.ADD_CHAR)
+                    next_key = self.klayout.keys_info.get(word[i + 1])
+                    if next_key is not None and next_key.klayer_id == klayer_id:
+                        events = (Typo.TRANSPOSE_CHAR,) + events
 
+            # Then sample one of these events (like `sample_among`, walking the
+            # cumulative probabilities with a single random number)
             # If it's the last character (and we are not typing a space),
             # don't add deletions typos, because it's an auto-completion case,
             # not auto-correction
-            if is_last_char and word != SPACE:
-                events = [e for e in events if e not in DELETIONS]
-
-            # Get the probabilities for these possible events
-            typo_probs = {e: self.probs[e] for e in events}
-            if is_first_char:
-                # Deleting the first character of the word is not so common, update the probabilities accordingly
-                typo_probs = {e: p * FRONT_DELETION_MULTIPLIER if e in DELETIONS else p for e, p in typo_probs.items()}
-
-            # And sample one of them
-            typo = sample_among(typo_probs)
+            # Deleting the first character of the word is not so common, so
+            # update the probabilities accordingly
+            skip_deletions = is_last_char and word != SPACE
+            r = random.random()
+            cumulative_p = 0
+            typo = None
+            for e in events:
+                p = self.probs[e]
+                if e in DELETIONS:
+                    if skip_deletions:
+                        continue
+                    if is_first_char:
+                        p *= FRONT_DELETION_MULTIPLIER
+                cumulative_p += p
+                if r < cumulative_p:
+                    typo = e
+                    break
 
             # Process the typo
             if typo is Typo.TRANSPOSE_CHAR:
                 noisy_char = word_chars[i + 1]
                 word_chars[i + 1] = char
-            elif typo in [Typo.DELETE_SPELLING_SYMBOL, Typo.DELETE_SPACE, Typo.DELETE_PUNCTUATION, Typo.DELETE_CHAR]:
+            elif typo in DELETIONS:
                 noisy_char = ""
-            elif typo in [Typo.ADD_SPELLING_SYMBOL, Typo.ADD_SPACE, Typo.ADD_PUNCTUATION, Typo.ADD_CHAR]:
+            elif typo in ADDITIONS:
                 noisy_char = f"{char}{char}"
             else:  # No typo
                 noisy_char = char
@@ -377,7 +386,11 @@ class NoiseModel:
             # Sample a keystroke for this character
             # Note that we don't generate typos for characters outside of the default keyboard
             if error_free or klayer_id != 0:
+                # The keystroke is the center of the key, so no need to
+                # convert it back to a character : it's the key of this
+                # character
                 keystroke = (x_center, y_center)
+                fuzzy_char = char
             else:
                 # Compute mu and sigma for the Normal distribution
                 x_mu = x_center + self.x_offset
@@ -388,8 +401,8 @@ class NoiseModel:
                 # Sample a position (x and y)
                 keystroke = (random.gauss(x_mu, x_sigma), random.gauss(y_mu, y_sigma))
 
-            # Convert it back to a character, to see where we tapped
-            fuzzy_char = self.klayout.get_key(keystroke, klayer_id)
+                # Convert it back to a character, to see where we tapped
+                fuzzy_char = self.klayout.get_key(keystroke, klayer_id)
 
             # Save it (save the keystroke only if part of the default keyboard)
             keystrokes.append(keystroke if klayer_id == 0 else None)
@@ -416,8 +429,36 @@ class NoiseModel:
             True if the word is correctable (and therefore we can introduce
             typo), False otherwise.
         """
-        # Use the Unicode category `L` (see https://en.wikipedia.org/wiki/Unicode_character_property#General_Category)
-        return not bool(re.match(r"^[^\pL]+$", word))
+        return not word or LETTER_RE.search(word) is not None
+
+    def _get_char_typos(self) -> Dict[str, Tuple[int, Tuple[Typo, ...]]]:
+        """Classify once each character of the keyboard, to know which typos
+        can be introduced on it (depending on the character type).
+
+        Returns:
+            Dictionary where the keys are the characters that can have typos,
+                and the values are the keyboard layer ID of the character and
+                the possible typos for this character (excluding
+                transpositions, which depend on the next character).
+        """
+        char_typos = {}
+        for char, k in self.klayout.keys_info.items():
+            if char.isnumeric():
+                # Don't introduce typos for numbers
+                continue
+            elif char in self.klayout.spelling_symbols:
+                events = SPELLING_SYMBOL_TYPOS
+            elif char.isspace():
+                events = SPACE_TYPOS
+            elif char in string.punctuation:
+                events = PUNCTUATION_TYPOS
+            elif k.klayer_id == 0:
+                events = CHAR_TYPOS
+            else:
+                events = ()
+
+            char_typos[char] = (k.klayer_id, events)
+        return char_typos
 
     def _get_common_typos(self) -> Dict[str, List[str]]:
         """Retrieve the list (if it exists) of plausible common typos to use
@@ -427,30 +468,65 @@ class NoiseModel:
             Dictionary where the keys are the correct words and the values are
                 the associated possible typos for this word.
         """
-        plang = self.lang.split("-")[0]
-        common_typos_cache_file = os.path.join(CACHE_DIR, f"{plang}.json")
-
-        # Try to access the cached common typos, and if it fails, it means we
-        # don't have it locally
-        try:
-            with open(common_typos_cache_file, "r") as f:
-                return json.load(f)
-        except FileNotFoundError:
-            pass
-
-        # File is not cached, download & process the common typos from online
-        os.makedirs(os.path.dirname(common_typos_cache_file), exist_ok=True)
-        typos = defaultdict(list)
-        if plang == "en":
-            response = requests.get(TWEET_TYPO_CORPUS_URL)
-            for line in response.text.strip().split("\n"):
-                typoed_word, correct_word, *_ = line.split("\t")
-                typos[correct_word].append(typoed_word)
-        else:
-            return {}
+        return load_common_typos(self.lang)
+
 
-        # Save the retrieved typos in cache
-        with open(common_typos_cache_file, "w") as f:
-            json.dump(typos, f, indent=4)
+@functools.lru_cache(maxsize=None)
+def load_default_layout(lang: str) -> LayoutHelper:
+    """Load the default keyboard layout used by the noise model for the given
+    language.
 
-        return typos
+    The layout is cached : creating several noise models for the same language
+    reuses the same `LayoutHelper` (which is never modified).
+
+    Args:
+        lang (str): Language of the layout to load.
+
+    Returns:
+        The keyboard layout.
+    """
+    return LayoutHelper(lang, ignore_layers_after=3)
+
+
+@functools.lru_cache(maxsize=None)
+def load_common_typos(lang: str) -> Dict[str, List[str]]:
+    """Retrieve the list (if it exists) of plausible common typos to use
+    when introducing typos.
+
+    The common typos are cached : loading the same language again returns the
+    same object, so it should not be modified in place.
+
+    Args:
+        lang (str): Language of the common typos to load.
+
+    Returns:
+        Dictionary where the keys are the correct words and the values are
+            the associated possible typos for this word.
+    """
+    plang = lang.split("-")[0]
+    common_typos_cache_file = os.path.join(CACHE_DIR, f"{plang}.json")
+
+    # Try to access the cached common typos, and if it fails, it means we
+    # don't have it locally
+    try:
+        return load_json(common_typos_cache_file)
+    except FileNotFoundError:
+        pass
+
+    # File is not cached, download & process the common typos from online
+    if plang == "en":
+        corpus = requests.get(TWEET_TYPO_CORPUS_URL).text
+    else:
+        return {}
+
+    typos = defaultdict(list)
+    for line in corpus.strip().splitlines():
+        typoed_word, correct_word, *_ = line.split("\t", 2)
+        typos[correct_word].append(typoed_word)
+
+    # Save the retrieved typos in cache
+    os.makedirs(os.path.dirname(common_typos_cache_file), exist_ok=True)
+    with open(common_typos_cache_file, "w") as f:
+        json.dump(typos, f, indent=4)
+
+    return typos
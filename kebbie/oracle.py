@@ -8,7 +8,7 @@ import hashlib
 import multiprocessing as mp
 import os
 import random
-from typing import Callable, Dict, List, Optional, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 from tqdm import tqdm
 
@@ -24,13 +24,12 @@ MAX_CHAR_PER_SENTENCE = 256
 SWIPE_PROB = 0.01  # 1 / 100 is tested with swiping
 
 
-def init_tester(
-    fn: Callable, lang: str, custom_keyboard: Dict, correctors: mp.Queue, seed: int, track_mistakes: bool
-) -> None:
+def init_tester(fn: Callable, noisy: NoiseModel, correctors: mp.Queue, seed: int, track_mistakes: bool) -> None:
     """Function run at process initialization for Tester workers.
 
     Each worker in a Pool will run this function when created. It will
-    instanciate several things needed for testing the given corrector :
+    instanciate or attach several things needed for testing the given
+    corrector :
      * A Tokenizer to split sentences into words
      * A NoiseModel to introduce typos
      * A Corrector instance, which is the model we want to test
@@ -38,10 +37,9 @@ def init_tester(
     Args:
         fn (Callable): Main tester function (instanciated objects will be
             attached to this function).
-        lang (str): Language used.
-        custom_keyboard (Dict, optional): If provided, instead of relying on
-            the keyboard layout provided by default, uses the given keyboard
-            layout.
+        noisy (NoiseModel): The NoiseModel to use. It's created once in the
+            main process (the layout and the common typos are only loaded
+            once), and shared with the workers.
         correctors (mp.Queue): Queue containing list of correctors to test.
             Each process will get the next corrector available in queue.
         seed (int): Base seed to use.
@@ -49,7 +47,7 @@ def init_tester(
             mistakes.
     """
     fn.tokenizer = BasicTokenizer()
-    fn.noisy = NoiseModel(lang, custom_keyboard=custom_keyboard)
+    fn.noisy = noisy
     fn.corrector = correctors.get()
     fn.base_seed = seed
     fn.track_mistakes = track_mistakes
@@ -71,7 +69,7 @@ def tester(sentence: str) -> Scorer:
     # Set the seed for reproducibility, using the hash of the sentence
     hsh = int(hashlib.sha256(sentence.encode("utf-8")).hexdigest(), 16)
     random.seed(tester.base_seed + hsh)
-    rnd_state = random.getstate()
+    rnd_state = None
 
     # Tokenize the sentence into words
     sentence = tester.tokenizer.preprocess(sentence)
@@ -82,7 +80,9 @@ def tester(sentence: str) -> Scorer:
     scorer = Scorer(domains=[None], track_mistakes=tester.track_mistakes)
     while words and len(context) < MAX_CHAR_PER_SENTENCE:
         # Before randomly generating typo, set the random state for determinism
-        random.setstate(rnd_state)
+        # (for the first word, the random generator was just seeded)
+        if rnd_state is not None:
+            random.setstate(rnd_state)
 
         # It's slow to generate swipe gesture every sentence, so run it just sometimes
         word_to_swipe = words[0]
@@ -127,6 +127,26 @@ def tester(sentence: str) -> Scorer:
     return scorer
 
 
+def domain_tester(domain_and_sentence: Tuple[str, str]) -> Scorer:
+    """Function to test a given sentence of a given domain.
+
+    It runs `tester` on the sentence, and associates the resulting scores to
+    the domain of the sentence. This allows to send the sentences of all
+    domains to the workers as a single stream.
+
+    Args:
+        domain_and_sentence (Tuple[str, str]): Domain name and sentence to use
+            as data for the test.
+
+    Returns:
+        Scorer class with the prediction counts for this sentence.
+    """
+    domain, sentence = domain_and_sentence
+    scorer = tester(sentence)
+    scorer.set_domain(domain)
+    return scorer
+
+
 class Oracle:
     """Class that takes care of testing a Corrector. It basically gets clean
     text data, adds noise to it, send the noisy data to the Corrector, and
@@ -202,18 +222,24 @@ class Oracle:
             for c in corrector:
                 proc_correctors.put(c)
 
+        # Create the noise model once : workers don't need to load the layout
+        # and the common typos again (when processes are forked, they don't
+        # even need to copy it)
+        noisy = NoiseModel(self.lang, custom_keyboard=self.custom_keyboard)
+
         with mp.Pool(
             processes=n_proc,
             initializer=init_tester,
-            initargs=(tester, self.lang, self.custom_keyboard, proc_correctors, seed, self.track_mistakes),
+            initargs=(tester, noisy, proc_correctors, seed, self.track_mistakes),
         ) as pool, tqdm(total=d_size) as pbar:
             # Test data is made of several domain, where each domain contains a list of sentences
-            for domain, sentence_list in self.data.items():
-                chunk_size = max(min(CHUNK_SIZE, len(sentence_list) // n_proc), 1)
-                for scr in pool.imap_unordered(tester, sentence_list, chunksize=chunk_size):
-                    scr.set_domain(domain)
-                    scorer.add(scr)
-                    pbar.update(1)
+            # Sentences from all domains are sent as a single stream, so workers
+            # don't wait for the last chunks of a domain before starting the next one
+            inputs = ((domain, sentence) for domain, sentence_list in self.data.items() for sentence in sentence_list)
+            chunk_size = max(min(CHUNK_SIZE, d_size // (n_proc * 4)), 1)
+            for scr in pool.imap_unordered(domain_tester, inputs, chunksize=chunk_size):
+                scorer.add(scr)
+                pbar.update(1)
 
         # Retrieve the results
         results = scorer.score(beta=self.beta)
@@ -6,7 +6,7 @@ from __future__ import annotations
 
 import statistics as stats
 from collections import Counter, defaultdict
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from functools import partial
 from typing import Dict, List, Optional
 
@@ -17,9 +17,10 @@ from kebbie.utils import accuracy, fbeta, human_readable_memory, human_readable_
 DEFAULT_BETA = 0.9
 WITH_TYPO = "with_typo"
 WITHOUT_TYPO = "without_typo"
+COMPLETION_RATE_BUCKETS = ["<25%", "25%~50%", "50%~75%", ">75%"]
 
 
-@dataclass
+@dataclass(init=False)
 class Count:
     """Structure representing the most basic counts for a task.
 
@@ -27,11 +28,22 @@ class Count:
     * Number of correct predictions
     * Number of top3-correct predictions
     * Total number of predictions
+
+    There is one `Count` per bucket of each task, so it uses `__slots__` to
+    keep them small. Class-level defaults would conflict with `__slots__`, so
+    the constructor is written by hand.
     """
 
-    correct: int = 0  # Number of times the first prediction was correct
-    correct_3: int = 0  # Number of times one of the top-3 predictions was correct
-    total: int = 0  # Total number of predictions
+    __slots__ = ("correct", "correct_3", "total")
+
+    correct: int  # Number of times the first prediction was correct
+    correct_3: int  # Number of times one of the top-3 predictions was correct
+    total: int  # Total number of predictions
+
+    def __init__(self, correct: int = 0, correct_3: int = 0, total: int = 0):
+        self.correct = correct
+        self.correct_3 = correct_3
+        self.total = total
 
     def __add__(self, count: Count) -> Count:
         """Merge two `Count` instance by adding their counts.
@@ -48,6 +60,21 @@ class Count:
             total=self.total + count.total,
         )
 
+    def __iadd__(self, count: Count) -> Count:
+        """Merge another `Count` instance into this one, in-place (without
+        creating a new `Count`).
+
+        Args:
+            count (Count): Count instance to add.
+
+        Returns:
+            This Count, updated.
+        """
+        self.correct += count.correct
+        self.correct_3 += count.correct_3
+        self.total += count.total
+        return self
+
     def __mul__(self, proportion: float) -> Count:
         """Multiply the current `Count` instance by a given proportion.
 
@@ -64,15 +91,42 @@ class Count:
         )
 
 
-@dataclass(eq=True, frozen=True)
+@dataclass(eq=False)
 class Mistake:
     """Structure representing a mistake (including the context of the mistake,
     the expected word and the predictions).
+
+    Mistakes are used as `Counter` keys, and only the expected word is used for
+    comparison and hashing, so that the same mistake made in different contexts
+    is counted together. Instances should be treated as immutable.
     """
 
-    actual: str = field(compare=True)
-    preds: List[str] = field(compare=False)
-    context: str = field(compare=False)
+    __slots__ = ("actual", "preds", "context")
+
+    actual: str
+    preds: List[str]
+    context: str
+
+    def __eq__(self, other: object) -> bool:
+        """Compare two mistakes, based only on their expected word.
+
+        Args:
+            other (object): Object to compare with.
+
+        Returns:
+            `True` if both mistakes are about the same expected word.
+        """
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.actual == other.actual
+
+    def __hash__(self) -> int:
+        """Hash the mistake, based only on its expected word.
+
+        Returns:
+            Hash of the mistake.
+        """
+        return hash(self.actual)
 
 
 def dd_x_layers(n_layers: int = 1) -> defaultdict:
@@ -185,11 +239,11 @@ class Scorer:
         """
 
         def update(d1, d2):
-            for k in d2:
-                if isinstance(d2[k], Count):
-                    d1[k] += d2[k]
+            for k, v in d2.items():
+                if isinstance(v, Count):
+                    d1[k] += v
                 else:
-                    update(d1[k], d2[k])
+                    update(d1[k], v)
 
         update(self.nwp_c, scorer.nwp_c)
         update(self.acp_c, scorer.acp_c)
@@ -235,16 +289,17 @@ class Scorer:
             self.nwp_runtimes.append(runtime)
 
         # Record counts
+        c = self.nwp_c[domain]
         if len(predicted_words) > 0 and predicted_words[0] == true_word:
-            self.nwp_c[domain].correct += 1
+            c.correct += 1
         if true_word in predicted_words[:3]:
-            self.nwp_c[domain].correct_3 += 1
-        else:
+            c.correct_3 += 1
+        elif self.track_mistakes:
             # If the word is not in the top-3 predictions, this is a mistake
-            if self.track_mistakes:
-                self.nwp_mistakes.update([Mistake(actual=true_word, preds=predicted_words[:3], context=context)])
+            mistake = Mistake(actual=true_word, preds=predicted_words[:3], context=context)
+            self.nwp_mistakes[mistake] += 1
 
-        self.nwp_c[domain].total += 1
+        c.total += 1
 
     def acp(
         self,
@@ -281,18 +336,17 @@ class Scorer:
         completion_rate = round(len(partial_word) / len(true_word), 2)
 
         # Record counts
+        c = self.acp_c[domain][has_typo][completion_rate]
         if len(predicted_words) > 0 and predicted_words[0] == true_word:
-            self.acp_c[domain][has_typo][completion_rate].correct += 1
+            c.correct += 1
         if true_word in predicted_words[:3]:
-            self.acp_c[domain][has_typo][completion_rate].correct_3 += 1
-        else:
+            c.correct_3 += 1
+        elif self.track_mistakes:
             # If the word is not in the top-3 predictions, this is a mistake
-            if self.track_mistakes:
-                self.acp_mistakes.update(
-                    [Mistake(actual=true_word, preds=predicted_words[:3], context=f"{context}{partial_word}")]
-                )
+            mistake = Mistake(actual=true_word, preds=predicted_words[:3], context=f"{context}{partial_word}")
+            self.acp_mistakes[mistake] += 1
 
-        self.acp_c[domain][has_typo][completion_rate].total += 1
+        c.total += 1
 
     def acr(
         self,
@@ -332,18 +386,17 @@ class Scorer:
             typo_type = len(typos)
 
         # Record counts
+        c = self.acr_c[domain][typo_type]
         if len(predicted_words) > 0 and predicted_words[0] == true_word:
-            self.acr_c[domain][typo_type].correct += 1
+            c.correct += 1
         if true_word in predicted_words[:3]:
-            self.acr_c[domain][typo_type].correct_3 += 1
-        else:
+            c.correct_3 += 1
+        elif self.track_mistakes:
             # If the word is not in the top-3 predictions, this is a mistake
-            if self.track_mistakes:
-                self.acr_mistakes.update(
-                    [Mistake(actual=true_word, preds=predicted_words[:3], context=f"{context}{typed_word}")]
-                )
+            mistake = Mistake(actual=true_word, preds=predicted_words[:3], context=f"{context}{typed_word}")
+            self.acr_mistakes[mistake] += 1
 
-        self.acr_c[domain][typo_type].total += 1
+        c.total += 1
 
     def swp(
         self,
@@ -371,16 +424,17 @@ class Scorer:
             self.swp_runtimes.append(runtime)
 
         # Record counts
+        c = self.swp_c[domain]
         if len(predicted_words) > 0 and predicted_words[0] == true_word:
-            self.swp_c[domain].correct += 1
+            c.correct += 1
         if true_word in predicted_words[:3]:
-            self.swp_c[domain].correct_3 += 1
-        else:
+            c.correct_3 += 1
+        elif self.track_mistakes:
             # If the word is not in the top-3 predictions, this is a mistake
-            if self.track_mistakes:
-                self.swp_mistakes.update([Mistake(actual=true_word, preds=predicted_words[:3], context=context)])
+            mistake = Mistake(actual=true_word, preds=predicted_words[:3], context=context)
+            self.swp_mistakes[mistake] += 1
 
-        self.swp_c[domain].total += 1
+        c.total += 1
 
     def set_domain(self, domain: str) -> None:
         """Method setting the domain for the scores associated with no domain.
@@ -554,35 +608,18 @@ class Scorer:
         }
 
         # --- Auto-completion ---
-        # Group scores by domain
-        per = defaultdict(Count)
+        # Group scores by domain, by completion rate and by with_typo / without_typo
+        per_d, per_cr, per_t = defaultdict(Count), defaultdict(Count), defaultdict(Count)
         for domain, d1 in self.acp_c.items():
             for has_typo, d2 in d1.items():
                 for compl_rate, c in d2.items():
-                    per[domain] += c
-        total_c = sum(per.values(), Count())
-        per_domain = {k: self._score_accuracy(c) for k, c in per.items()}
-
-        # Group scores by completion rate
-        per = defaultdict(Count)
-        for domain, d1 in self.acp_c.items():
-            for has_typo, d2 in d1.items():
-                for compl_rate, c in d2.items():
-                    per[compl_rate] += c
-        per_compl_rate = {
-            "<25%": self._score_accuracy(sum((c for k, c in per.items() if k < 0.25), Count())),
-            "25%~50%": self._score_accuracy(sum((c for k, c in per.items() if 0.25 <= k < 0.5), Count())),
-            "50%~75%": self._score_accuracy(sum((c for k, c in per.items() if 0.5 <= k < 0.75), Count())),
-            ">75%": self._score_accuracy(sum((c for k, c in per.items() if 0.75 <= k), Count())),
-        }
-
-        # Group scores by with_typo / without_typo
-        per = defaultdict(Count)
-        for domain, d1 in self.acp_c.items():
-            for has_typo, d2 in d1.items():
-                for compl_rate, c in d2.items():
-                    per[has_typo] += c
-        per_other = {k: self._score_accuracy(per[k]) for k in [WITHOUT_TYPO, WITH_TYPO]}
+                    per_d[domain] += c
+                    per_t[has_typo] += c
+                    per_cr[COMPLETION_RATE_BUCKETS[min(int(compl_rate * 4), 3)]] += c
+        total_c = sum(per_d.values(), Count())
+        per_domain = {k: self._score_accuracy(c) for k, c in per_d.items()}
+        per_compl_rate = {k: self._score_accuracy(per_cr[k]) for k in COMPLETION_RATE_BUCKETS}
+        per_other = {k: self._score_accuracy(per_t[k]) for k in [WITHOUT_TYPO, WITH_TYPO]}
 
         # Task results
         acp = {
@@ -594,46 +631,39 @@ class Scorer:
         }
 
         # --- Auto-correction ---
-        # Group scores by domain
-        no_typo_per, typo_per = defaultdict(Count), defaultdict(Count)
-        for domain, d1 in self.acr_c.items():
-            for typo, c in d1.items():
-                if typo is None:
-                    no_typo_per[domain] += c
-                else:
-                    typo_per[domain] += c
-        no_typo_total_c = sum(no_typo_per.values(), Count())
-        typo_total_c = sum(typo_per.values(), Count())
-        per_domain = {k: self._score_precision_recall(no_typo_per[k], typo_per[k], beta=beta) for k in no_typo_per}
-
-        # Group scores by typo type
+        # Group scores by domain and by typo type
+        no_typo_per_d, typo_per_d = defaultdict(Count), defaultdict(Count)
         no_typo_c, typo_per = Count(), defaultdict(Count)
         for domain, d1 in self.acr_c.items():
             for typo, c in d1.items():
                 if typo is None:
+                    no_typo_per_d[domain] += c
                     no_typo_c += c
                 else:
+                    typo_per_d[domain] += c
                     typo_per[typo] += c
+        typo_total_c = sum(typo_per_d.values(), Count())
+        per_domain = {
+            k: self._score_precision_recall(no_typo_per_d[k], typo_per_d[k], beta=beta) for k in no_typo_per_d
+        }
+
         # Divide the total count of no-typo into each type of typos with the right proportions
         no_typo_per = defaultdict(Count, {k: no_typo_c * (c.total / typo_total_c.total) for k, c in typo_per.items()})
         per_typo_type = {t.name: self._score_precision_recall(no_typo_per[t], typo_per[t], beta=beta) for t in Typo}
+
+        # Group by number of typos (a single typo is stored as its type, several typos as their number)
+        no_typo_per_n, typo_per_n = defaultdict(Count), defaultdict(Count)
+        for k, c in typo_per.items():
+            n_typos = "1" if isinstance(k, Typo) else ("2" if k == 2 else "3+")
+            no_typo_per_n[n_typos] += no_typo_per[k]
+            typo_per_n[n_typos] += c
         per_n_typo = {
-            "1": self._score_precision_recall(
-                sum((c for k, c in no_typo_per.items() if isinstance(k, Typo)), Count()),
-                sum((c for k, c in typo_per.items() if isinstance(k, Typo)), Count()),
-                beta=beta,
-            ),
-            "2": self._score_precision_recall(no_typo_per[2], typo_per[2], beta=beta),
-            "3+": self._score_precision_recall(
-                sum((c for k, c in no_typo_per.items() if isinstance(k, int) and k > 2), Count()),
-                sum((c for k, c in typo_per.items() if isinstance(k, int) and k > 2), Count()),
-                beta=beta,
-            ),
+            n: self._score_precision_recall(no_typo_per_n[n], typo_per_n[n], beta=beta) for n in ["1", "2", "3+"]
         }
 
         # Task results
         acr = {
-            "score": self._score_precision_recall(no_typo_total_c, typo_total_c, beta=beta),
+            "score": self._score_precision_recall(no_typo_c, typo_total_c, beta=beta),
             "per_domain": per_domain,
             "per_typo_type": per_typo_type,
             "per_number_of_typos": per_n_typo,
@@ -6,6 +6,10 @@ import re
 from typing import List
 
 
+POINTS_RE = re.compile(r"\s*\.+\s*")
+PUNCTUATIONS_RE = re.compile(r"\s*[,:;\(\)\"!?\[\]\{\}~]\s*")
+
+
 class BasicTokenizer:
     """A basic tokenizer, used for regular latin languages.
     This tokenizer simply use space as word separator. Since it is used for
@@ -43,8 +47,8 @@ class BasicTokenizer:
         # not, etc...). So for now we just get rid of the punctuations, it's a
         # convenient shortcut and it's fair to all keyboards.
         # Eventually we should find a better way to deal with that.
-        sentence = re.sub(r"\s*\.+\s*", " ", sentence)
-        sentence = re.sub(r"\s*[,:;\(\)\"!?\[\]\{\}~]\s*", " ", sentence)
+        sentence = POINTS_RE.sub(" ", sentence)
+        sentence = PUNCTUATIONS_RE.sub(" ", sentence)
 
         return sentence
 
@@ -1,29 +1,60 @@
 """Various utils function used by `kebbie`."""
 
+import functools
 import json
 import math
+import os
 import random
+import sys
 import time
 import tracemalloc
 import unicodedata
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
-import datasets
+import numpy as np
 
 
-SEC_TO_NANOSEC = 10e9
+try:
+    import orjson
+except ImportError:  # Optional dependency, fallback to `json`
+    orjson = None
 
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
 
-def profile_fn(fn: Callable, *args: Any, **kwargs: Any) -> Tuple[Any, int, int]:
+
+# `ru_maxrss` is given in kilobytes on Linux, but in bytes on macOS
+MAXRSS_TO_BYTES = 1 if sys.platform == "darwin" else 1024
+SODA_SHUFFLE_BUFFER_SIZE = 10_000
+
+
+def profile_fn(fn: Callable, *args: Any, rss_memory: bool = False, **kwargs: Any) -> Tuple[Any, int, int]:
     """Profile the runtime and memory usage of the given function.
 
-    Note that it will only account for memory allocated by python (if you use
-    a library in C/C++ that does its own allocation, it won't report it).
+    By default, the memory usage is the peak of the memory allocated during
+    the call, traced with `tracemalloc`. Note that it will only account for
+    memory allocated by python (if you use a library in C/C++ that does its
+    own allocation, it won't report it).
+
+    If `tracemalloc` was already started by the caller, it's kept running,
+    but its peak is reset (each call needs its own peak, and `tracemalloc`
+    can't restore a previous peak).
+
+    Set `rss_memory` to `True` to measure the peak growth instead : the
+    increase of the peak resident memory of the process. It's cheaper and
+    accounts for all allocations, but it's only non-zero when the function
+    goes above the previous peak of the process (so after a warm-up, it will
+    usually be 0). It's not available on Windows (where `tracemalloc` is
+    used instead).
 
     Args:
         fn (Callable): Function to profile.
         *args: Positional arguments to pass to the given function.
+        rss_memory (bool, optional): If `True`, measure the peak growth of
+            the resident memory instead of using `tracemalloc`.
         **kwargs: Keywords arguments to pass to the given function.
 
     Returns:
@@ -31,15 +62,33 @@ def profile_fn(fn: Callable, *args: Any, **kwargs: Any) -> Tuple[Any, int, int]:
         The memory usage (in bytes).
         The runtime (in nano seconds).
     """
-    tracemalloc.start()
-    t0 = time.time()
+    if rss_memory and resource is not None:
+        m0 = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        t0 = time.perf_counter_ns()
+
+        result = fn(*args, **kwargs)
 
-    result = fn(*args, **kwargs)
+        runtime = time.perf_counter_ns() - t0
+        memory = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - m0) * MAXRSS_TO_BYTES
+    else:
+        # Only stop tracing if we started it, and measure relatively to the
+        # current traced memory (note that this resets the caller's peak)
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        m0, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        t0 = time.perf_counter_ns()
 
-    runtime = time.time() - t0
-    _, memory = tracemalloc.get_traced_memory()
+        result = fn(*args, **kwargs)
 
-    return result, memory, runtime * SEC_TO_NANOSEC
+        runtime = time.perf_counter_ns() - t0
+        _, peak = tracemalloc.get_traced_memory()
+        memory = peak - m0
+        if not was_tracing:
+            tracemalloc.stop()
+
+    return result, memory, runtime
 
 
 def euclidian_dist(p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
@@ -52,24 +101,102 @@ def euclidian_dist(p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
     Returns:
         Euclidian distance between the 2 given points.
     """
-    return math.sqrt(sum((a - b) ** 2 for a, b in zip(p1, p2)))
+    return math.hypot(p1[0] - p2[0], p1[1] - p2[1])
+
+
+def euclidian_dist_sq(p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
+    """Function computing the squared euclidian distance between 2 points.
+
+    It skips the square root, so it's cheaper than `euclidian_dist` when the
+    distance is only used for comparisons.
+
+    Args:
+        p1 (Tuple[float, float]): Point 1.
+        p2 (Tuple[float, float]): Point 2.
+
+    Returns:
+        Squared euclidian distance between the 2 given points.
+    """
+    dx = p1[0] - p2[0]
+    dy = p1[1] - p2[1]
+    return dx * dx + dy * dy
+
+
+def euclidian_dists_sq(p: Tuple[float, float], points: np.ndarray) -> np.ndarray:
+    """Function computing the squared euclidian distances between a point and
+    an array of points, in a single vectorized operation. The square root is
+    skipped because only the ordering of the distances matters to find the
+    closest point.
+
+    Args:
+        p (Tuple[float, float]): Reference point.
+        points (np.ndarray): Array of points, of shape `(N, 2)`.
+
+    Returns:
+        Array of shape `(N,)`, containing the squared euclidian distance
+        between the reference point and each of the given points.
+    """
+    return ((points - np.asarray(p)) ** 2).sum(axis=1)
 
 
+def load_json(path: Union[str, os.PathLike]) -> Any:
+    """Load a JSON file, with `orjson` if it's installed (it's faster), or
+    with the standard `json` module otherwise.
+
+    Args:
+        path (Union[str, os.PathLike]): Path of the JSON file to load.
+
+    Returns:
+        The parsed content of the file.
+    """
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    else:
+        with open(path, "r") as f:
+            return json.load(f)
+
+
+@functools.lru_cache(maxsize=None)
 def load_keyboard(lang: str = "en-US") -> Dict:
     """Load the keyboard data for the given language.
 
     For now, only `en-US` is supported.
 
+    The keyboard data is cached : loading the same language again returns the
+    same object, so it should not be modified in place.
+
     Args:
         lang (str, optional): Language of the keyboard to load.
 
     Returns:
         The keyboard data.
     """
-    layout_folder = Path(__file__).parent / "layouts"
-    with open(layout_folder / f"{lang}.json", "r") as f:
-        keyboard = json.load(f)
-    return keyboard
+    return load_json(Path(__file__).parent / "layouts" / f"{lang}.json")
+
+
+class AccentsTable(dict):
+    """Translation table (to use with `str.translate`) removing the accents of
+    each character. The table is filled lazily : the accents of a character
+    are removed (using its NFKD form) the first time it's seen.
+    """
+
+    def __missing__(self, codepoint: int) -> str:
+        """Remove the accents of a character not seen yet, and save it in the
+        table.
+
+        Args:
+            codepoint (int): Unicode code point of the character.
+
+        Returns:
+            The character without accent.
+        """
+        nfkd_form = unicodedata.normalize("NFKD", chr(codepoint))
+        self[codepoint] = "".join([c for c in nfkd_form if not unicodedata.combining(c)])
+        return self[codepoint]
+
+
+ACCENTS_TABLE = AccentsTable()
 
 
 def strip_accents(s: str) -> str:
@@ -81,8 +208,9 @@ def strip_accents(s: str) -> str:
     Returns:
         Same string, without accent.
     """
-    nfkd_form = unicodedata.normalize("NFKD", s)
-    return "".join([c for c in nfkd_form if not unicodedata.combining(c)])
+    if s.isascii():
+        return s
+    return s.translate(ACCENTS_TABLE)
 
 
 def sample(proba: float) -> bool:
@@ -103,7 +231,7 @@ def sample(proba: float) -> bool:
     elif proba == 1:
         return True
     else:
-        return random.choices([True, False], weights=[proba, 1 - proba])[0]
+        return random.random() < proba
 
 
 def sample_among(probs: Dict[Any, float], with_none: bool = True) -> Any:
@@ -120,17 +248,25 @@ def sample_among(probs: Dict[Any, float], with_none: bool = True) -> Any:
     Returns:
         The corresponding key of the event sampled.
     """
-    options = list(probs.keys())
-    weights = list(probs.values())
+    total = sum(probs.values())
     assert (
-        all(w >= 0 for w in weights) and sum(weights) <= 1
+        all(w >= 0 for w in probs.values()) and total <= 1
     ), "The numbers given are not a probability (should be above 0 and their sum should not exceed 1)"
 
-    if with_none:
-        options.append(None)
-        weights.append(1 - sum(weights))
+    # Draw a single number, and walk the cumulative probabilities to find the
+    # corresponding event. Without the `None` option, the probabilities are
+    # normalized (by scaling the drawn number)
+    r = random.random() if with_none else random.random() * total
+    cumulative_p = 0
+    option = None
+    for option, p in probs.items():
+        cumulative_p += p
+        if r < cumulative_p:
+            return option
 
-    return random.choices(options, weights=weights)[0]
+    # Without the `None` option, the drawn number can still be above the
+    # running sum, because `sum()` may be more accurate than it
+    return None if with_none else option
 
 
 def sample_partial_word(
@@ -159,8 +295,14 @@ def sample_partial_word(
         The partial list of keystrokes (sampled from the given word).
         The partial word (sampled from the given word).
     """
-    r = range(1, min(len(true_word), len(word)))
-    s = random.choices(r, weights=r)[0]
+    n = min(len(true_word), len(word)) - 1
+
+    # The weights form a triangular distribution, so instead of relying on
+    # `random.choices` (which computes the cumulative weights at each call),
+    # directly use the inverse of the CDF : the cumulative weight of `s` is
+    # s * (s + 1) / 2
+    x = random.random() * n * (n + 1) / 2
+    s = min(int((math.sqrt(1 + 8 * x) - 1) / 2) + 1, n)
     return keystrokes[:s], word[:s]
 
 
@@ -259,7 +401,9 @@ def human_readable_memory(x: int) -> str:
     Returns:
         Human-readable version of the given number, with the right unit.
     """
-    x = round_to_n(x, n=3)
+    # Formatting with `.3g` rounds to 3 significant digits, no need for
+    # `round_to_n`
+    x = float(f"{x:.3g}")
     for unit in ["B", "KB", "MB", "GB"]:
         if x < 1000:
             return f"{x:g} {unit}"
@@ -278,7 +422,7 @@ def human_readable_runtime(x: int) -> str:
     Returns:
         Human-readable version of the given number, with the right unit.
     """
-    x = round_to_n(x, n=3)
+    x = float(f"{x:.3g}")
     for unit in ["ns", "μs", "ms"]:
         if x < 1000:
             return f"{x:g} {unit}"
@@ -287,7 +431,7 @@ def human_readable_runtime(x: int) -> str:
     return f"{x:g} s"
 
 
-def get_soda_dataset(max_sentences: int = 2_000, seed: int = 31) -> Dict[str, List[str]]:
+def get_soda_dataset(max_sentences: int = 2_000, seed: int = 31, streaming: bool = False) -> Dict[str, List[str]]:
     """Load the SODA dataset.
 
     Args:
@@ -297,25 +441,44 @@ def get_soda_dataset(max_sentences: int = 2_000, seed: int = 31) -> Dict[str, Li
         seed (int, optional): Seed to use when shuffling the dataset (since we
             don't use the whole dataset, it's better to shuffle it before
             extracting the X first sentences).
+        streaming (bool, optional): If set to `True`, stream the dataset
+            instead of downloading (and caching) the whole split. It's
+            faster the first time, but it requires network access on every
+            call, and the dataset is shuffled with a buffer of
+            `SODA_SHUFFLE_BUFFER_SIZE` samples only. So it gives a
+            **different sample** of sentences than the default, and results
+            are not comparable with the leaderboard.
 
     Returns:
         The dataset, separated into two domains : narrative and dialogue.
     """
+    # `datasets` is slow to import and only needed here, so import it lazily
+    import datasets
+
     data = {"narrative": [], "dialogue": []}
     max_domain_sentences = max_sentences // 2
 
-    hf_dataset = datasets.load_dataset("allenai/soda", split="test")
-    hf_dataset = hf_dataset.shuffle(seed=seed)
+    if streaming:
+        hf_dataset = datasets.load_dataset("allenai/soda", split="test", streaming=True)
+        hf_dataset = hf_dataset.shuffle(seed=seed, buffer_size=SODA_SHUFFLE_BUFFER_SIZE)
+    else:
+        hf_dataset = datasets.load_dataset("allenai/soda", split="test")
+        hf_dataset = hf_dataset.shuffle(seed=seed)
 
+    n_narrative, n_dialogue = 0, 0
     for sample in hf_dataset:
-        if len(data["narrative"]) >= max_domain_sentences and len(data["dialogue"]) >= max_domain_sentences:
-            break
-
-        if len(data["narrative"]) < max_domain_sentences:
+        if n_narrative < max_domain_sentences:
             data["narrative"].append(sample["narrative"])
+            n_narrative += 1
 
         for sen in sample["dialogue"]:
-            if len(data["dialogue"]) < max_domain_sentences:
-                data["dialogue"].append(sen)
+            if n_dialogue >= max_domain_sentences:
+                break
+
+            data["dialogue"].append(sen)
+            n_dialogue += 1
+
+        if n_narrative >= max_domain_sentences and n_dialogue >= max_domain_sentences:
+            break
 
     return data
@@ -21,6 +21,7 @@ extras_require = {
     "hook": ["pre-commit~=3.0"],
     "lint": ["ruff~=0.2"],
     "docs": ["mkdocs-material~=9.0", "mkdocstrings[python]~=0.18", "mike~=2.0"],
+    "speedups": ["numba~=0.59", "orjson~=3.9"],
 }
 extras_require["all"] = sum(extras_require.values(), [])
 extras_require["dev"] = (
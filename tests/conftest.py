@@ -91,17 +91,25 @@ class MockDataset:
             ],
         }
 
-    def shuffle(self, seed: int = 0):
+    def shuffle(self, seed: int = 0, **kwargs):
+        self.shuffle_kwargs = kwargs
         return self
 
 
 @pytest.fixture
 def mock_load_dataset(monkeypatch):
     # Mock dataset to avoid downloading a full-fledge dataset
+    # The created datasets are returned, so tests can check how they were loaded
+    datasets_loaded = []
+
     def mock_load_dataset(*args, **kwargs):
-        return MockDataset()
+        dataset = MockDataset()
+        dataset.load_kwargs = kwargs
+        datasets_loaded.append(dataset)
+        return dataset
 
     monkeypatch.setattr(datasets, "load_dataset", mock_load_dataset)
+    return datasets_loaded
 
 
 @pytest.fixture
@@ -1,51 +1,27 @@
-import subprocess
-from dataclasses import dataclass
-
 import pytest
 
 import kebbie
 from kebbie.emulator import Emulator
 
 
-class DummyStdout:
-    def __init__(self, out: str):
-        self.out = out
-
-    def decode(self) -> str:
-        return self.out
-
-
-@dataclass
-class SubprocessResult:
-    stdout: DummyStdout
-
-
-def test_get_android_devices(monkeypatch):
-    def android_subprocess(*args, **kwargs):
-        return SubprocessResult(
-            DummyStdout(
-                """List of devices attached
+def test_parse_android_devices():
+    devices = Emulator._parse_android_devices(
+        b"""List of devices attached
 emulator-5554	device
+emulator-5556	offline
 emulator-5558	device
 
 """
-            )
-        )
-
-    monkeypatch.setattr(subprocess, "run", android_subprocess)
-
-    devices = Emulator.get_android_devices()
+    )
 
     assert len(devices) == 2
     assert devices[0] == "emulator-5554"
     assert devices[1] == "emulator-5558"
 
 
-def test_get_ios_devices(monkeypatch):
-    def ios_subprocess(*args, **kwargs):
-        return SubprocessResult(
-            DummyStdout(
-                """== Devices ==
+def test_parse_ios_devices():
+    devices = Emulator._parse_ios_devices(
+        b"""== Devices ==
 -- iOS 14.4 --
     iPhone 12 mini (8A192CB8-A72C-4BBA-9A98-2476E66ABEF8) (Shutdown) (unavailable)
     iPhone 12 (C0E1F6AB-FDA5-4953-BB22-7CDB09D3B303) (Shutdown) (unavailable)
@@ -74,19 +50,18 @@ def test_get_ios_devices(monkeypatch):
     iPad mini (6th generation) (EC7F8EF2-D5A6-437B-9531-E2DBE924FB5A) (Shutdown) (unavailable)
     iPad Pro (11-inch) (4th generation) (49F56D2F-5722-41CD-9C11-D4979084DA3E) (Shutdown) (unavailable)
     iPad Pro (12.9-inch) (6th generation) (08E5485D-D293-4B7B-9831-F29D55EDA053) (Shutdown) (unavailable)
+-- iOS 17.5 --
+    iPad Pro (11-inch) (4th generation) (7D6B9E5C-2E4A-4B8E-9C1A-0F1E2D3C4B5A) (Booted)
 """
-            )
-        )
-
-    monkeypatch.setattr(subprocess, "run", ios_subprocess)
+    )
 
-    devices = Emulator.get_ios_devices()
-
-    assert len(devices) == 2
+    assert len(devices) == 3
     assert devices[0][0] == "17.4"
     assert devices[0][1] == "iPhone_15_2"
     assert devices[1][0] == "17.4"
     assert devices[1][1] == "iPhone_15_3"
+    assert devices[2][0] == "17.5"
+    assert devices[2][1] == "iPad Pro (11-inch) (4th generation)"
 
 
 def test_undefined_platform():
@@ -1,9 +1,10 @@
 import pytest
 
+import kebbie
 from kebbie.layout import LayoutHelper
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def layout():
     return LayoutHelper()
 
@@ -91,3 +92,20 @@ def test_special_keys_that_should_exist(layout, k):
 def test_special_keys_that_should_not_exist(layout, k):
     with pytest.raises(KeyError):
         layout.get_key_info(k)
+
+
+@pytest.mark.parametrize("use_numba", [True, False])
+def test_get_key_with_and_without_numba(layout, monkeypatch, use_numba):
+    monkeypatch.setattr(kebbie.layout, "NUMBA_AVAILABLE", use_numba)
+
+    f_width, f_height, f_x_center, f_y_center, _ = layout.get_key_info("f")
+    assert layout.get_key((f_x_center, f_y_center), 0) == "f"
+    assert layout.get_key((f_x_center + f_width / 3, f_y_center - f_height / 3), 0) == "f"
+    assert layout.get_key((f_x_center + f_width + 1, f_y_center), 0) != "f"
+    assert layout.get_key((-5000, -5000), 0) == "q"
+
+
+def test_get_key_at_key_center(layout):
+    # The center of each key should always give back the same character
+    for char, k in layout.keys_info.items():
+        assert layout.get_key(k.center, k.klayer_id) == char
@@ -1,7 +1,9 @@
+import pickle
+
 import pytest
 
 import kebbie
-from kebbie.noise_model import NoiseModel, Typo
+from kebbie.noise_model import NoiseModel, Typo, load_common_typos
 
 
 def test_retrieve_common_typos_cached(noisy):
@@ -12,6 +14,23 @@ def test_retrieve_common_typos_cached(noisy):
     assert noisy.common_typos == noisy2.common_typos
 
 
+def test_retrieve_common_typos_from_disk_cache(noisy):
+    # Bypass the in-memory cache, to make sure we go through the disk cache
+    assert load_common_typos.__wrapped__("en-US") == noisy.common_typos
+
+
+def test_typos_are_usable_as_keys_after_pickling():
+    typos = pickle.loads(pickle.dumps({Typo.ADD_CHAR: 1, Typo.DELETE_CHAR: 2}))
+
+    assert typos[Typo.ADD_CHAR] == 1
+    assert typos[Typo.DELETE_CHAR] == 2
+    assert "__hash__" not in Typo.__members__
+
+
+def test_default_layout_is_shared(noisy):
+    assert NoiseModel("en-US").klayout is noisy.klayout
+
+
 def test_common_typos_with_unsupported_language(noisy):
     noisy2 = NoiseModel("en-US")
     noisy2.lang = "fr-FR"  # We don't have a list of common typos for French
@@ -272,6 +291,24 @@ def test_introduce_typos_add_char(noisy, seeded, monkeypatch):
     assert len(typos) == 2 and all(t == Typo.ADD_CHAR for t in typos)
 
 
+@pytest.mark.parametrize(
+    "char, events",
+    [
+        ("e", (Typo.DELETE_CHAR, Typo.ADD_CHAR)),
+        (" ", (Typo.DELETE_SPACE, Typo.ADD_SPACE)),
+        ("-", (Typo.DELETE_SPELLING_SYMBOL, Typo.ADD_SPELLING_SYMBOL)),
+        ("!", (Typo.DELETE_PUNCTUATION, Typo.ADD_PUNCTUATION)),
+    ],
+)
+def test_char_typos_depend_on_character_type(noisy, char, events):
+    assert noisy.char_typos[char][1] == events
+
+
+@pytest.mark.parametrize("char", ["1", "☂"])
+def test_char_typos_without_numbers_and_unknown_characters(noisy, char):
+    assert char not in noisy.char_typos
+
+
 def test_introduce_typos_dont_add_typos_on_numbers(noisy, seeded, monkeypatch):
     with monkeypatch.context() as m:
         # Set probability of typo to 1 for this test, to ensure it's generated
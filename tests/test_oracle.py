@@ -1,3 +1,5 @@
+from collections import deque
+
 import pytest
 
 from kebbie import Corrector
@@ -65,13 +67,13 @@ class MockQueue:
     """
 
     def __init__(self):
-        self.q = []
+        self.q = deque()
 
     def put(self, x):
         self.q.append(x)
 
     def get(self):
-        return self.q.pop(0)
+        return self.q.popleft()
 
 
 @pytest.fixture
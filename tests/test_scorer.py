@@ -3,7 +3,7 @@ from collections import defaultdict
 import pytest
 
 from kebbie.noise_model import Typo
-from kebbie.scorer import Count, Scorer, dd_x_layers
+from kebbie.scorer import Count, Mistake, Scorer, dd_x_layers
 
 
 def test_count_addition():
@@ -17,6 +17,18 @@ def test_count_addition():
     assert c3.total == 356 + 25
 
 
+def test_count_inplace_addition():
+    c1 = Count(56, 133, 356)
+    c2 = Count(3, 23, 25)
+    c1_ref = c1
+
+    c1 += c2
+
+    assert c1 is c1_ref
+    assert c1 == Count(56 + 3, 133 + 23, 356 + 25)
+    assert c2 == Count(3, 23, 25)
+
+
 def test_count_multiplication_int():
     c1 = Count(56, 133, 356)
 
@@ -422,6 +434,18 @@ def test_save_mistakes_swp():
     assert m[1] == 1
 
 
+def test_mistakes_are_grouped_by_expected_word():
+    s = Scorer([], track_mistakes=True)
+
+    s.nwp(true_word="ok", predicted_words=["a", "b", "c"], context="first", memory=-1, runtime=-1)
+    s.nwp(true_word="ok", predicted_words=["d", "e", "f"], context="second", memory=-1, runtime=-1)
+    s.nwp(true_word="ko", predicted_words=["a", "b", "c"], context="first", memory=-1, runtime=-1)
+
+    assert s.nwp_mistakes[Mistake(actual="ok", preds=[], context="")] == 2
+    assert s.nwp_mistakes[Mistake(actual="ko", preds=[], context="")] == 1
+    assert Mistake(actual="ok", preds=[], context="") != "ok"
+
+
 def test_add_scorers():
     s1 = Scorer([], track_mistakes=True)
 
@@ -1,16 +1,23 @@
 import math
 import random
+import tracemalloc
 from collections import Counter
+from pathlib import Path
 
+import numpy as np
 import pytest
 
+import kebbie
 from kebbie.utils import (
     accuracy,
     euclidian_dist,
+    euclidian_dist_sq,
+    euclidian_dists_sq,
     fbeta,
     get_soda_dataset,
     human_readable_memory,
     human_readable_runtime,
+    load_json,
     load_keyboard,
     precision,
     profile_fn,
@@ -40,6 +47,13 @@ SQRT_29 = math.sqrt(29)
 )
 def test_euclidian_dist(p1, p2, d):
     assert euclidian_dist(p1, p2) == d
+    assert euclidian_dist_sq(p1, p2) == pytest.approx(d**2)
+
+
+def test_euclidian_dists_sq():
+    points = np.array([(1, 0), (0, 1), (5, 2), (-2, -5)])
+
+    assert np.allclose(euclidian_dists_sq((0, 0), points), [1, 1, 29, 29])
 
 
 @pytest.mark.parametrize("kwargs", [{}, {"lang": "en-US"}])
@@ -53,12 +67,28 @@ def test_load_keyboard_valid_language(kwargs):
     assert "char_dict" in kb
 
 
+def test_load_keyboard_cached():
+    assert load_keyboard("en-US") is load_keyboard("en-US")
+
+
+def test_load_json_same_with_json_and_orjson(monkeypatch):
+    orjson = pytest.importorskip("orjson")
+    layout_file = Path(kebbie.__file__).parent / "layouts" / "en-US.json"
+
+    monkeypatch.setattr(kebbie.utils, "orjson", orjson)
+    with_orjson = load_json(layout_file)
+    monkeypatch.setattr(kebbie.utils, "orjson", None)
+    with_json = load_json(layout_file)
+
+    assert with_orjson == with_json
+
+
 def test_load_keyboard_non_existing_language():
     with pytest.raises(FileNotFoundError):
         load_keyboard(lang="klingon")
 
 
-@pytest.mark.parametrize("inp, out", [("éclair", "eclair"), ("ça", "ca")])
+@pytest.mark.parametrize("inp, out", [("éclair", "eclair"), ("ça", "ca"), ("ÉTÉ", "ETE"), ("e\u0301clair", "eclair")])
 def test_strip_accents_with_accents(inp, out):
     assert strip_accents(inp) == out
 
@@ -110,6 +140,16 @@ def test_sample_among_without_none():
     assert sample_among({"a": 0.9, "b": 0.1}, with_none=False) == "a"
 
 
+def test_sample_among_without_none_never_returns_none(monkeypatch):
+    # Simulate a draw that reaches the total : it can happen when the running
+    # sum of the probabilities is slightly below their total (`sum()` uses
+    # compensated summation from Python 3.12)
+    monkeypatch.setattr(random, "random", lambda: 1.0)
+    probs = {i: 0.1 for i in range(10)}
+
+    assert sample_among(probs, with_none=False) == 9
+
+
 def test_sample_partial_word_basic():
     w = "absolutely"
     partial_list, partial_w = sample_partial_word(list(range(len(w))), w, w)
@@ -160,6 +200,40 @@ def test_profile_fn():
     assert runtime > 0
 
 
+def test_profile_fn_measures_each_call_separately():
+    _, big_memory, _ = profile_fn(lambda x: [0] * x, 100_000)
+    _, small_memory, _ = profile_fn(lambda x: [0] * x, 1000)
+
+    assert big_memory >= 8 * 100_000
+    assert 8 * 1000 <= small_memory < 8 * 100_000
+
+
+def test_profile_fn_keeps_caller_tracing():
+    tracemalloc.start()
+    try:
+        # Raise the caller's peak before profiling
+        big = [0] * 100_000
+        del big
+
+        _, memory, _ = profile_fn(lambda x: [0] * x, 1000)
+
+        assert tracemalloc.is_tracing()
+        assert memory >= 8 * 1000
+        # The caller's peak is reset (documented behavior)
+        assert tracemalloc.get_traced_memory()[1] < 8 * 100_000
+    finally:
+        tracemalloc.stop()
+
+
+def test_profile_fn_rss_memory():
+    result, memory, runtime = profile_fn(lambda x: [0] * x, 1000, rss_memory=True)
+
+    assert result == [0] * 1000
+    assert memory >= 0
+    assert runtime > 0
+    assert not tracemalloc.is_tracing()
+
+
 @pytest.mark.parametrize(
     "mem, s",
     [
@@ -167,6 +241,8 @@ def test_profile_fn():
         (1_200, "1.2 KB"),
         (6_000_000, "6 MB"),
         (6_356_754, "6.36 MB"),
+        (3_655, "3.66 KB"),
+        (9_995, "10 KB"),
         (132_000_000_000, "132 GB"),
         (45_000_000_000_000, "45 TB"),
         (45_555_000_000_000_000, "45600 TB"),
@@ -185,6 +261,8 @@ def test_human_readable_memory(mem, s):
         (6_882_987, "6.88 ms"),
         (66_882_987, "66.9 ms"),
         (665_482_987, "665 ms"),
+        (3_655, "3.66 μs"),
+        (9_995, "10 μs"),
         (132_000_000_000, "132 s"),
         (132_222_000_000_000, "132000 s"),
     ],
@@ -212,3 +290,13 @@ def test_get_soda_dataset(mock_load_dataset, max_sentences, n_narrative, n_dialo
     # Dummy dataset has only 20 samples
     assert len(dataset["narrative"]) == n_narrative
     assert len(dataset["dialogue"]) == n_dialogue
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_get_soda_dataset_streaming_is_opt_in(mock_load_dataset, streaming):
+    kwargs = {"streaming": True} if streaming else {}
+    dataset = get_soda_dataset(max_sentences=10, **kwargs)
+
+    assert len(dataset["narrative"]) == 5
+    assert mock_load_dataset[0].load_kwargs.get("streaming", False) == streaming
+    assert ("buffer_size" in mock_load_dataset[0].shuffle_kwargs) == streaming